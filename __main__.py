@@ -1,6 +1,7 @@
 # sdk_assistant/__main__.py
 import typer
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich import print
 import sys
@@ -10,6 +11,17 @@ from typing import Optional
 from sdk_assistant import SDKAssistant
 from sdk_assistant.utils.logger import setup_logger
 
+# Use uvloop when available: drop-in event loop with much lower overhead
+# for the socket-heavy scraping/LLM-streaming workload. uvloop does not
+# build on Windows, so gate on platform rather than relying on the
+# import failing.
+if sys.platform != 'win32':
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
 
 # At the top of __main__.py
 try:
@@ -89,7 +101,17 @@ def start(description: str = typer.Option(..., help="Description of what you're
             console.print("\n[red]Error: Missing required environment variables[/red]")
             sys.exit(1)
             
-        asyncio.run(run_assistant(description))
+        # Build one explicit loop instead of asyncio.run so repeated
+        # REPL-style entry reuses a single loop and avoids the
+        # deprecated get_event_loop() setup path on 3.10+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        # Bound the thread pool used for offloaded HTML parsing
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=4))
+        try:
+            loop.run_until_complete(run_assistant(description))
+        finally:
+            loop.close()
     except KeyboardInterrupt:
         console.print("\n[yellow]Session terminated by user[/yellow]")
     except Exception as e:
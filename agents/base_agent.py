@@ -1,43 +1,285 @@
 # agents/base_agent.py
 from typing import Optional, Dict, Any
+import aiohttp
+import asyncio
 import autogen
-from ..ai.openai_client import OpenAIClient
+import functools
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from ..ai.openai_client import OpenAIClient, BatchProcessor
 from ..ai.claude_client import ClaudeClient
 
+_PROMPT_DIR = Path(__file__).resolve().parent.parent / "templates" / "prompts"
+
+@functools.lru_cache(maxsize=32)
+def _load_prompt_template(name: str) -> str:
+    """Read a prompt template from templates/prompts, cached per name.
+
+    Templates are immutable at runtime, so the disk read happens once
+    per process instead of once per agent invocation.
+    """
+    return (_PROMPT_DIR / name).read_text()
+
+class DocsCache:
+    """TTL cache for scraped documentation, persisted across runs.
+
+    Scrapes are pure functions of the package/error type, so repeat
+    lookups within the TTL can skip the network entirely.
+    """
+
+    def __init__(self, ttl: int = 3600, maxsize: int = 512, path: Optional[Path] = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.path = path or Path.home() / ".cache" / "sdk_assistant" / "docs.json"
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or time.time() > entry["expires"]:
+            return None
+        return entry["value"]
+
+    def get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the raw entry even if expired (for conditional revalidation)."""
+        return self._entries.get(key)
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        return time.time() <= entry["expires"]
+
+    def set(self, key: str, value: Any,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        if len(self._entries) >= self.maxsize:
+            # Evict the entry closest to expiry to stay bounded
+            oldest = min(self._entries, key=lambda k: self._entries[k]["expires"])
+            del self._entries[oldest]
+        self._entries[key] = {
+            "value": value,
+            "expires": time.time() + self.ttl,
+            "etag": etag,
+            "last_modified": last_modified
+        }
+        self._persist()
+
+    def touch(self, key: str) -> None:
+        """Extend an entry's lifetime after a 304 revalidation."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry["expires"] = time.time() + self.ttl
+            self._persist()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text())
+            now = time.time()
+            self._entries = {k: v for k, v in data.items() if v.get("expires", 0) > now}
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def _persist(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self._entries))
+        except (OSError, TypeError):
+            pass
+
 class BaseAgent:
+    __slots__ = (
+        "config",
+        "openai_client",
+        "claude_client",
+        "_http",
+        "batch_processor",
+        "_inflight",
+        "assistant",
+        "user_proxy"
+    )
+
+    # Per-request timeout for documentation scrapes
+    HTTP_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+    # Shared across all agents so every scraper sees the same entries
+    docs_cache = DocsCache()
+
+    # Identically-configured autogen pairs are reused across agent
+    # instances: construction pays LLM-config parsing every time
+    _AGENT_POOL: Dict[str, Dict[str, Any]] = {}
+    _POOL_LOCK = threading.Lock()
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.openai_client = OpenAIClient(config["openai"])
         self.claude_client = ClaudeClient(config["anthropic"])
-        
-        # Initialize autogen agents
-        self.assistant = autogen.AssistantAgent(
-            name="assistant",
-            llm_config={
-                "config_list": [
-                    {
-                        "model": config["openai"]["model"],
-                        "api_key": config["openai"]["api_key"]
-                    }
-                ]
-            }
-        )
-        
-        self.user_proxy = autogen.UserProxyAgent(
-            name="user_proxy",
-            human_input_mode="NEVER",
-            max_consecutive_auto_reply=10
+        self._http: Optional[aiohttp.ClientSession] = None
+        self.batch_processor = BatchProcessor(
+            self.openai_client.client,
+            self.openai_client.model
         )
 
+        # Analyses currently in flight, keyed by content/template digest
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Initialize autogen agents (pooled by model/api key)
+        self.assistant, self.user_proxy = self._get_agent_pair(config["openai"])
+
+    @classmethod
+    def _get_agent_pair(cls, openai_config: Dict[str, Any]) -> tuple:
+        key = hashlib.blake2b(
+            f"{openai_config.get('model')}:{openai_config.get('api_key')}".encode(),
+            digest_size=16
+        ).hexdigest()
+
+        with cls._POOL_LOCK:
+            entry = cls._AGENT_POOL.get(key)
+            if entry is None:
+                assistant = autogen.AssistantAgent(
+                    name="assistant",
+                    llm_config={
+                        "config_list": [
+                            {
+                                "model": openai_config["model"],
+                                "api_key": openai_config["api_key"]
+                            }
+                        ]
+                    }
+                )
+                user_proxy = autogen.UserProxyAgent(
+                    name="user_proxy",
+                    human_input_mode="NEVER",
+                    max_consecutive_auto_reply=10
+                )
+                entry = {"pair": (assistant, user_proxy), "last_used": time.time()}
+                cls._AGENT_POOL[key] = entry
+            else:
+                entry["last_used"] = time.time()
+            return entry["pair"]
+
+    @classmethod
+    def cleanup_agent_pool(cls, max_idle: float = 600) -> None:
+        """Drop pooled agent pairs that have been idle longer than max_idle seconds."""
+        cutoff = time.time() - max_idle
+        with cls._POOL_LOCK:
+            for key in [k for k, e in cls._AGENT_POOL.items() if e["last_used"] < cutoff]:
+                del cls._AGENT_POOL[key]
+
+    def _load_prompt_template(self, name: str) -> str:
+        """Load a prompt template by filename (cached at module level)."""
+        return _load_prompt_template(name)
+
+    async def _get_http(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it lazily.
+
+        A single pooled session is reused for all scrapes so TCP/TLS
+        handshakes and DNS lookups amortize across requests.
+        """
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP session."""
+        if self._http and not self._http.closed:
+            await self._http.close()
+
+    async def _conditional_get(self, url: str, entry: Optional[Dict[str, Any]] = None) -> tuple:
+        """GET a URL, revalidating a stale cache entry when possible.
+
+        Sends If-None-Match/If-Modified-Since from the entry's stored
+        validators; a 304 costs zero body bytes and signals the cached
+        value is still good. Returns (status, text, etag, last_modified)
+        where text is None on 304.
+        """
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        session = await self._get_http()
+        async with session.get(url, timeout=self.HTTP_TIMEOUT, headers=headers) as response:
+            if response.status == 304:
+                return response.status, None, None, None
+            text = await response.text()
+            return (
+                response.status,
+                text,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified")
+            )
+
     async def run_analysis(self, content: str, prompt_template: str) -> Dict[str, Any]:
-        """Run analysis using both OpenAI and Claude, combine results"""
-        openai_response = await self.openai_client.analyze(content, prompt_template)
-        claude_response = await self.claude_client.analyze(content, prompt_template)
-        
+        """Run analysis using both OpenAI and Claude, combine results.
+
+        Concurrent callers asking for the same (content, template) pair
+        share one in-flight request instead of firing duplicates.
+        """
+        key = hashlib.blake2b(
+            content.encode() + prompt_template.encode(),
+            digest_size=16
+        ).hexdigest()
+
+        existing = self._inflight.get(key)
+        if existing is not None:
+            return await existing
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._run_analysis(content, prompt_template)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a waiterless failure doesn't warn at GC
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            # A cancelled leader skips both set_result and
+            # set_exception; cancel the shared future too so waiters
+            # don't hang on a value that will never arrive
+            if not future.done():
+                future.cancel()
+
+    async def _run_analysis(self, content: str, prompt_template: str) -> Dict[str, Any]:
+        # The two calls are independent, so run them concurrently;
+        # one model failing must not abort the other
+        openai_response, claude_response = await asyncio.gather(
+            self.openai_client.analyze(content, prompt_template),
+            self.claude_client.analyze(content, prompt_template),
+            return_exceptions=True
+        )
+
+        if isinstance(openai_response, Exception):
+            openai_response = {"error": str(openai_response)}
+        if isinstance(claude_response, Exception):
+            claude_response = {"error": str(claude_response)}
+
         # Combine insights from both models
         combined_analysis = self._merge_analyses(openai_response, claude_response)
         return combined_analysis
 
+    async def run_batch_analysis(self, items: Dict[str, tuple]) -> Dict[str, Any]:
+        """Run many analyses through the OpenAI Batch API.
+
+        items maps a custom_id to a (content, prompt_template) pair.
+        Use this for end-of-session aggregation (error digests, tutorial
+        material) rather than the live execute_command path.
+        """
+        for custom_id, (content, prompt_template) in items.items():
+            self.batch_processor.add(custom_id, [
+                {"role": "system", "content": prompt_template},
+                {"role": "user", "content": content}
+            ])
+        return await self.batch_processor.run()
+
     def _merge_analyses(self, openai_analysis: Dict, claude_analysis: Dict) -> Dict:
         """Merge analyses from different models, keeping unique insights"""
         # Implementation depends on the specific analysis structure
@@ -1,16 +1,77 @@
 # agents/command_analyzer.py
 from typing import Dict, Any
 from .base_agent import BaseAgent
+import asyncio
+import hashlib
 import re
 from bs4 import BeautifulSoup
-import requests
+
+# selectolax's C-backed parser is an order of magnitude faster than
+# BeautifulSoup for pulling a couple of CSS-selected nodes
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# Shell builtins and trivial commands that don't warrant an LLM round-trip
+_TRIVIAL_CMDS = frozenset({
+    "ls", "pwd", "cd", "echo", "cat", "clear", "env", "which", "whoami", "history"
+})
+
+# Absolute/relative path tokens, replaced by a placeholder when building
+# a structural cache key so equivalent commands share an analysis
+_PATH_TOKEN_RE = re.compile(r"^(~|\.{1,2})?/\S*$")
 
 class CommandAnalyzerAgent(BaseAgent):
+    __slots__ = ("command_context", "_docs_semaphore", "_analysis_cache")
+
+    # Timeout for a single scrape so one hung host doesn't stall the batch
+    SCRAPE_TIMEOUT = 10
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.command_context = {}
+        # Bound concurrent scrapes to stay under PyPI/ReadTheDocs rate limits
+        self._docs_semaphore = asyncio.Semaphore(8)
+        # Per-session analysis cache keyed on the normalized command
+        self._analysis_cache = {}
+
+    @staticmethod
+    def _normalize_command(command: str) -> str:
+        """Build a structural cache key: path arguments collapse to a
+        placeholder so reruns against different files still hit."""
+        return " ".join(
+            "<path>" if _PATH_TOKEN_RE.match(part) else part
+            for part in command.split()
+        )
 
     async def analyze_command(self, command: str, output: str) -> Dict[str, Any]:
+        # DIRECT path: trivial commands skip the LLM entirely
+        parts = command.split()
+        executable = parts[0] if parts else command
+        if executable in _TRIVIAL_CMDS:
+            return {
+                "command": command,
+                "packages": [],
+                "documentation": {},
+                "analysis": {
+                    "summary": f"Trivial shell command '{executable}'; no analysis needed",
+                    "source": "direct"
+                }
+            }
+
+        # Previously-seen commands reuse the session's cached analysis.
+        # The output digest is part of the key: a rerun that now fails
+        # (or prints something new) must not return the stale analysis
+        # of the earlier outcome.
+        cache_key = (
+            self._normalize_command(command),
+            hashlib.blake2b(output.encode(), digest_size=8).hexdigest()
+        )
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Extract package names and documentation
         packages = self._extract_packages(command)
         docs = await self._fetch_package_docs(packages)
@@ -22,45 +83,109 @@ class CommandAnalyzerAgent(BaseAgent):
             analysis_prompt
         )
         
-        return {
+        result = {
             "command": command,
             "packages": packages,
             "documentation": docs,
             "analysis": analysis
         }
+        self._analysis_cache[cache_key] = result
+        return result
 
     async def _fetch_package_docs(self, packages: list) -> Dict[str, str]:
-        docs = {}
-        for package in packages:
-            # Use autogen for web scraping
-            scraping_task = f"Fetch documentation for Python package {package}"
-            chat = await self.user_proxy.initiate_chat(
-                self.assistant,
-                message=scraping_task
+        # Fetch all packages concurrently instead of one at a time
+        results = await asyncio.gather(
+            *(self._fetch_single_package_docs(package) for package in packages)
+        )
+        return dict(zip(packages, results))
+
+    async def _fetch_single_package_docs(self, package: str) -> Dict[str, Any]:
+        async with self._docs_semaphore:
+            # Parse PyPI and ReadTheDocs in parallel
+            pypi_info, readthedocs = await asyncio.gather(
+                self._scrape_with_timeout(self._scrape_pypi(package)),
+                self._scrape_with_timeout(self._scrape_readthedocs(package))
             )
-            
-            # Parse PyPI and ReadTheDocs
-            pypi_info = await self._scrape_pypi(package)
-            readthedocs = await self._scrape_readthedocs(package)
-            
-            docs[package] = {
+
+            return {
                 "pypi": pypi_info,
                 "readthedocs": readthedocs
             }
-        
-        return docs
+
+    async def _scrape_with_timeout(self, coro) -> Dict[str, Any]:
+        try:
+            return await asyncio.wait_for(coro, timeout=self.SCRAPE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return {"error": f"Timed out after {self.SCRAPE_TIMEOUT}s"}
 
     async def _scrape_pypi(self, package: str) -> Dict[str, Any]:
+        cache_key = f"pypi:{package.lower().strip()}"
+        entry = self.docs_cache.get_entry(cache_key)
+        if entry and self.docs_cache.is_fresh(entry):
+            return entry["value"]
+
         url = f"https://pypi.org/project/{package}/"
-        
+
         try:
-            response = requests.get(url)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            return {
-                "description": soup.find("div", {"class": "project-description"}).text,
-                "version": soup.find("h1", {"class": "package-header__name"}).text,
-                "url": url
-            }
+            status, text, etag, last_modified = await self._conditional_get(url, entry)
+            if status == 304 and entry:
+                self.docs_cache.touch(cache_key)
+                return entry["value"]
+
+            # Parse on a worker thread so the event loop stays free to
+            # service other in-flight scrapes and LLM streams
+            info = await asyncio.to_thread(self._parse_pypi_page, text, url)
+            self.docs_cache.set(cache_key, info, etag=etag, last_modified=last_modified)
+            return info
         except Exception as e:
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+
+    @staticmethod
+    def _parse_pypi_page(text: str, url: str) -> Dict[str, Any]:
+        if HTMLParser is not None:
+            tree = HTMLParser(text)
+            description = tree.css_first("div.project-description")
+            version = tree.css_first("h1.package-header__name")
+            if description is not None and version is not None:
+                return {
+                    "description": description.text(),
+                    "version": version.text(),
+                    "url": url
+                }
+
+        # Fall back to BeautifulSoup when selectolax is unavailable or misses
+        soup = BeautifulSoup(text, 'html.parser')
+        return {
+            "description": soup.find("div", {"class": "project-description"}).text,
+            "version": soup.find("h1", {"class": "package-header__name"}).text,
+            "url": url
+        }
+
+    async def _scrape_readthedocs(self, package: str) -> Dict[str, Any]:
+        cache_key = f"readthedocs:{package.lower().strip()}"
+        entry = self.docs_cache.get_entry(cache_key)
+        if entry and self.docs_cache.is_fresh(entry):
+            return entry["value"]
+
+        url = f"https://{package}.readthedocs.io/en/latest/"
+
+        try:
+            status, text, etag, last_modified = await self._conditional_get(url, entry)
+            if status == 304 and entry:
+                self.docs_cache.touch(cache_key)
+                return entry["value"]
+
+            info = await asyncio.to_thread(self._parse_readthedocs_page, text, url)
+            self.docs_cache.set(cache_key, info, etag=etag, last_modified=last_modified)
+            return info
+        except Exception as e:
+            return {"error": str(e)}
+
+    @staticmethod
+    def _parse_readthedocs_page(text: str, url: str) -> Dict[str, Any]:
+        soup = BeautifulSoup(text, 'html.parser')
+        return {
+            "title": soup.title.string if soup.title else None,
+            "sections": [h.text for h in soup.find_all(['h1', 'h2', 'h3'])],
+            "url": url
+        }
\ No newline at end of file
@@ -4,6 +4,8 @@ from typing import Dict, Any, List
 import markdown2
 
 class DocGeneratorAgent(BaseAgent):
+    __slots__ = ()
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
 
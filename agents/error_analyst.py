@@ -1,32 +1,85 @@
 # agents/error_analyst.py
 from typing import Dict, List, Any, Optional
 from .base_agent import BaseAgent
+import asyncio
 import re
 import json
 import traceback
 from bs4 import BeautifulSoup
-import requests
 import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from datetime import datetime
 
+# selectolax's C-backed parser is an order of magnitude faster than
+# BeautifulSoup for pulling a couple of CSS-selected nodes
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+def _dumps(obj: Any) -> str:
+    """Serialize with orjson when available; it is several times faster
+    than stdlib json on the nested traceback/documentation dicts."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+def _parse_exception_docs(text: str, anchor: str) -> Optional[str]:
+    """Pull the description for one exception out of the python-docs page."""
+    if HTMLParser is not None:
+        tree = HTMLParser(text)
+        node = tree.css_first(f'dt[id="{anchor}"]')
+        if node is not None:
+            sibling = node.next
+            while sibling is not None and sibling.tag != 'dd':
+                sibling = sibling.next
+            if sibling is not None:
+                return sibling.text()
+
+    # Fall back to BeautifulSoup when selectolax is unavailable or misses
+    soup = BeautifulSoup(text, 'html.parser')
+    error_section = soup.find('dt', {'id': anchor})
+    if error_section:
+        return error_section.find_next('dd').get_text()
+    return None
+
+# Error classification patterns; shared by every instance so the
+# combined alternation compiles once at import
+ERROR_PATTERNS = {
+    "import": r"ImportError:|ModuleNotFoundError:",
+    "syntax": r"SyntaxError:",
+    "runtime": r"RuntimeError:",
+    "attribute": r"AttributeError:",
+    "type": r"TypeError:",
+    "value": r"ValueError:",
+    "key": r"KeyError:",
+    "index": r"IndexError:",
+    "permission": r"PermissionError:",
+    "os": r"OSError:",
+    "file": r"FileNotFoundError:"
+}
+_ERROR_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in ERROR_PATTERNS.items())
+)
+
+# Precompiled traceback patterns, shared by every analysis call
+_LINE_RE = re.compile(r'[^\n]+')
+_TRACEBACK_FILE_RE = re.compile(r'File "([^"]+)", line (\d+)')
+_LOCALS_RE = re.compile(r'(\w+)\s*=\s*([^,]+)')
+
 class ErrorAnalystAgent(BaseAgent):
+    __slots__ = ("logger",)
+
+    error_patterns = ERROR_PATTERNS
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.logger = logging.getLogger(__name__)
-        self.error_patterns = {
-            "import": r"ImportError:|ModuleNotFoundError:",
-            "syntax": r"SyntaxError:",
-            "runtime": r"RuntimeError:",
-            "attribute": r"AttributeError:",
-            "type": r"TypeError:",
-            "value": r"ValueError:",
-            "key": r"KeyError:",
-            "index": r"IndexError:",
-            "permission": r"PermissionError:",
-            "os": r"OSError:",
-            "file": r"FileNotFoundError:"
-        }
-        
+
     async def analyze_error(self, error_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze an error using AI models and web scraping for context.
@@ -61,7 +114,7 @@ class ErrorAnalystAgent(BaseAgent):
             # Get AI analysis from both models
             analysis_prompt = self._load_prompt_template("error_analysis.txt")
             ai_analysis = await self.run_analysis(
-                json.dumps(analysis_context),
+                _dumps(analysis_context),
                 analysis_prompt
             )
             
@@ -84,10 +137,8 @@ class ErrorAnalystAgent(BaseAgent):
 
     def _identify_error_type(self, error_message: str) -> str:
         """Identify the type of error from the error message"""
-        for error_type, pattern in self.error_patterns.items():
-            if re.search(pattern, error_message):
-                return error_type
-        return "unknown"
+        match = _ERROR_RE.search(error_message)
+        return match.lastgroup if match else "unknown"
 
     def _analyze_traceback(self, traceback_str: str) -> Dict[str, Any]:
         """Analyze the traceback to extract useful information"""
@@ -99,31 +150,29 @@ class ErrorAnalystAgent(BaseAgent):
         }
         
         try:
-            # Parse traceback string
-            for line in traceback_str.split('\n'):
+            # Single pass over the traceback without materializing a line list
+            for line_match in _LINE_RE.finditer(traceback_str):
+                line = line_match.group()
                 if "File" in line:
                     # Extract filename and line number
-                    match = re.search(r'File "([^"]+)", line (\d+)', line)
+                    match = _TRACEBACK_FILE_RE.search(line)
                     if match:
                         filename, line_num = match.groups()
+                        line_number = int(line_num)
                         analysis["files_involved"].add(filename)
-                        analysis["line_numbers"].append(int(line_num))
-                        
-                        frame = {
+                        analysis["line_numbers"].append(line_number)
+                        analysis["frames"].append({
                             "file": filename,
-                            "line": int(line_num),
+                            "line": line_number,
                             "context": line.strip()
-                        }
-                        analysis["frames"].append(frame)
-                
-                # Look for local variables in traceback
-                if "locals" in line:
-                    vars_match = re.findall(r'(\w+)\s*=\s*([^,]+)', line)
-                    for var_name, var_value in vars_match:
+                        })
+                elif "locals" in line:
+                    # Look for local variables in traceback
+                    for var_name, var_value in _LOCALS_RE.findall(line):
                         analysis["local_vars"][var_name] = var_value.strip()
-            
+
             return analysis
-            
+
         except Exception as e:
             self.logger.warning(f"Error analyzing traceback: {str(e)}")
             return analysis
@@ -158,15 +207,24 @@ class ErrorAnalystAgent(BaseAgent):
 
     async def _scrape_python_docs(self, error_type: str) -> Optional[str]:
         """Scrape Python documentation for error type"""
+        cache_key = f"python_docs:{error_type.lower().strip()}"
+        entry = self.docs_cache.get_entry(cache_key)
+        if entry and self.docs_cache.is_fresh(entry):
+            return entry["value"]
+
         try:
             url = f"https://docs.python.org/3/library/exceptions.html#{error_type.lower()}"
-            response = requests.get(url)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                error_section = soup.find('dt', {'id': error_type.lower()})
-                if error_section:
-                    return error_section.find_next('dd').get_text()
-            return None
+            status, text, etag, last_modified = await self._conditional_get(url, entry)
+            if status == 304 and entry:
+                self.docs_cache.touch(cache_key)
+                return entry["value"]
+            if status != 200:
+                return None
+            # Parse on a worker thread to keep the event loop responsive
+            docs = await asyncio.to_thread(_parse_exception_docs, text, error_type.lower())
+            if docs is not None:
+                self.docs_cache.set(cache_key, docs, etag=etag, last_modified=last_modified)
+            return docs
         except Exception:
             return None
 
@@ -196,17 +254,15 @@ class ErrorAnalystAgent(BaseAgent):
 
     async def _generate_prevention_tips(self, ai_analysis: Dict[str, Any]) -> List[str]:
         """Generate tips to prevent similar errors in the future"""
-        prevention_tips = set()
-        
-        if "prevention" in ai_analysis:
-            prevention_tips.update(ai_analysis["prevention"])
-        
+        prevention_tips = list(ai_analysis.get("prevention", ()))
+
         # Add general best practices based on error type
         if "error_type" in ai_analysis:
-            best_practices = await self._fetch_best_practices(ai_analysis["error_type"])
-            prevention_tips.update(best_practices)
-        
-        return list(prevention_tips)
+            prevention_tips.extend(await self._fetch_best_practices(ai_analysis["error_type"]))
+
+        # Dedup while keeping insertion order: stable output makes
+        # downstream LLM prompt-cache hits more likely
+        return list(dict.fromkeys(prevention_tips))
 
     async def _find_similar_errors(self, error_type: str, error_message: str) -> List[Dict[str, Any]]:
         """Find similar errors from various sources"""
@@ -236,18 +292,18 @@ class ErrorAnalystAgent(BaseAgent):
 
     async def _fetch_best_practices(self, error_type: str) -> List[str]:
         """Fetch best practices for preventing specific types of errors"""
-        practices = set()
-        
+        practices = []
+
         # Use AI to generate best practices
         prompt = f"What are the best practices to prevent {error_type} errors in Python?"
-        
+
         try:
             response = await self.run_analysis(prompt, "best_practices_template.txt")
             if isinstance(response, dict) and "practices" in response:
-                practices.update(response["practices"])
-            
-            return list(practices)
-            
+                practices.extend(response["practices"])
+
+            return list(dict.fromkeys(practices))
+
         except Exception as e:
             self.logger.warning(f"Error fetching best practices: {str(e)}")
-            return list(practices)
\ No newline at end of file
+            return list(dict.fromkeys(practices))
\ No newline at end of file
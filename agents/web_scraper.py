@@ -4,43 +4,215 @@ from .base_agent import BaseAgent
 import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
+import diskcache
 import logging
-import json
 import re
 from urllib.parse import urljoin, urlparse
 import time
 from datetime import datetime
-import hashlib
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# selectolax's C-backed parser is 10-30x faster than BeautifulSoup's
+# pure-Python html.parser on multi-hundred-KB docs pages
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+def _parse_docs_overview(html: str, url: str) -> Dict[str, Any]:
+    """Extract the title and section headings from a docs page."""
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        title = tree.css_first('title')
+        return {
+            "url": url,
+            "title": title.text() if title else None,
+            "sections": [node.text() for node in tree.css('h1,h2,h3')],
+            "last_updated": datetime.now().isoformat()
+        }
+
+    soup = BeautifulSoup(html, 'html.parser')
+    return {
+        "url": url,
+        "title": soup.title.string if soup.title else None,
+        "sections": [
+            h.text for h in soup.find_all(['h1', 'h2', 'h3'])
+        ],
+        "last_updated": datetime.now().isoformat()
+    }
+
+def _parse_doc_page(html: str, url: str) -> Dict[str, Any]:
+    """Extract sections, code examples and title from a docs page."""
+    content = {
+        "url": url,
+        "title": None,
+        "sections": {},
+        "examples": [],
+        "api_reference": {}
+    }
+
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        title = tree.css_first('title')
+        content["title"] = title.text() if title else None
+
+        # Section bodies: walk each heading's sibling chain once
+        for heading in tree.css('h1,h2'):
+            section_content = []
+            node = heading.next
+            while node is not None and node.tag not in ('h1', 'h2'):
+                if node.tag != '-text':
+                    section_content.append(node.text())
+                node = node.next
+            content["sections"][heading.text().strip()] = "\n".join(section_content)
+
+        content["examples"] = [
+            node.text().strip() for node in tree.css('pre') if node.text().strip()
+        ]
+        return content
+
+    soup = BeautifulSoup(html, 'html.parser')
+    content["title"] = soup.title.string if soup.title else None
+
+    # Extract main sections
+    for heading in soup.find_all(['h1', 'h2']):
+        section_content = []
+
+        # Get all content until next heading
+        for elem in heading.next_siblings:
+            if elem.name in ['h1', 'h2']:
+                break
+            if elem.name:
+                section_content.append(elem.get_text())
+
+        content["sections"][heading.text.strip()] = "\n".join(section_content)
+
+    # Extract code examples
+    for code in soup.find_all('pre'):
+        if code.text.strip():
+            content["examples"].append(code.text.strip())
+
+    return content
+
+# Bound total outbound concurrency so a burst of package lookups can't
+# swamp the hosts (or our own connection pool)
+_REQUEST_SEMAPHORE = asyncio.Semaphore(10)
+
+async def _read_json(response) -> Any:
+    """Decode a JSON response body, using orjson when available.
+
+    PyPI payloads often exceed 100 KB; orjson parses them several times
+    faster than the stdlib decoder behind response.json().
+    """
+    if orjson is not None:
+        return orjson.loads(await response.read())
+    return await response.json()
+
+class TokenBucket:
+    """Async token bucket refilling at `rate` tokens/sec up to `capacity`.
+
+    Unlike the old sleep-until-minute-reset limiter this averages the
+    allowed rate accurately, never over-sleeps, and is safe under
+    concurrent callers.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+        self.cond = asyncio.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    async def acquire(self):
+        async with self.cond:
+            self._refill()
+            while self.tokens < 1:
+                # Wait just long enough for one token to accrue; a
+                # notify (or the timeout) re-checks the balance
+                wait = (1 - self.tokens) / self.rate
+                try:
+                    await asyncio.wait_for(self.cond.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                self._refill()
+            self.tokens -= 1
+
 class WebScraperAgent(BaseAgent):
+    __slots__ = ("logger", "cache_dir", "cache_duration", "session", "_host_idx", "_buckets", "_cache")
+
+    # Per-source timeout inside gather_package_info
+    FETCH_TIMEOUT = 10
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.logger = logging.getLogger(__name__)
         self.cache_dir = os.path.join(os.getcwd(), 'cache')
         self.cache_duration = 3600  # 1 hour cache duration
         self.session = None
-        
-        # Create cache directory if it doesn't exist
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
-        
-        # Rate limiting settings
-        self.rate_limits = {
-            "pypi.org": {"calls": 0, "last_reset": time.time(), "limit": 30},  # 30 calls per minute
-            "github.com": {"calls": 0, "last_reset": time.time(), "limit": 30},
-            "readthedocs.org": {"calls": 0, "last_reset": time.time(), "limit": 30}
-        }
+
+        # SQLite-indexed cache: O(1) lookups, per-key TTL and proactive
+        # LRU eviction, so the cache directory stays bounded
+        self._cache = diskcache.Cache(
+            self.cache_dir,
+            size_limit=512 << 20,
+            eviction_policy='least-recently-used'
+        )
+
+        # Rate limiting: 30 calls per minute per host, averaged by a
+        # token bucket instead of a hard per-minute reset. The hot
+        # per-host state lives in a compact list indexed by a one-shot
+        # host lookup rather than a dict of per-host dicts.
+        hosts = ("pypi.org", "github.com", "readthedocs.org")
+        self._host_idx = {host: i for i, host in enumerate(hosts)}
+        self._buckets = [TokenBucket(rate=30 / 60, capacity=30) for _ in hosts]
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared pooled session, creating it lazily.
+
+        One long-lived session means TCP/TLS handshakes and DNS lookups
+        to pypi.org / api.github.com / readthedocs.io amortize across
+        every fetch, whether or not the agent is used as a context
+        manager.
+        """
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=10,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30
+                ),
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={
+                    "User-Agent": "sdk-assistant",
+                    "Accept-Encoding": "gzip, deflate"
+                }
+            )
+        return self.session
+
+    async def aclose(self):
+        """Close the pooled session."""
+        if self.session and not self.session.closed:
+            await self.session.close()
 
     async def __aenter__(self):
         """Set up async context manager"""
-        self.session = aiohttp.ClientSession()
+        await self._get_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Clean up async context manager"""
-        if self.session:
-            await self.session.close()
+        await self.aclose()
 
     async def gather_package_info(self, package_name: str) -> Dict[str, Any]:
         """
@@ -59,19 +231,22 @@ class WebScraperAgent(BaseAgent):
             if cached_data:
                 return cached_data
 
-            # Gather information from multiple sources
+            # Gather information from multiple sources; one slow or
+            # failing host must not discard the others' results
             results = await asyncio.gather(
-                self._fetch_pypi_info(package_name),
-                self._fetch_github_info(package_name),
-                self._fetch_readthedocs_info(package_name),
-                self._fetch_package_docs(package_name)
+                self._bounded_fetch(self._fetch_pypi_info(package_name)),
+                self._bounded_fetch(self._fetch_github_info(package_name)),
+                self._bounded_fetch(self._fetch_rtd_combined(package_name)),
+                return_exceptions=True
             )
+            results = [None if isinstance(r, Exception) else r for r in results]
+            rtd_overview, rtd_docs = results[2] or (None, None)
 
             package_info = {
                 "pypi": results[0],
                 "github": results[1],
-                "readthedocs": results[2],
-                "documentation": results[3],
+                "readthedocs": rtd_overview,
+                "documentation": rtd_docs,
                 "last_updated": datetime.now().isoformat()
             }
 
@@ -84,19 +259,54 @@ class WebScraperAgent(BaseAgent):
             self.logger.error(f"Error gathering package info for {package_name}: {str(e)}")
             raise
 
+    async def _bounded_fetch(self, coro):
+        """Run one fetch under the shared concurrency bound and a timeout."""
+        async with _REQUEST_SEMAPHORE:
+            return await asyncio.wait_for(coro, timeout=self.FETCH_TIMEOUT)
+
+    def _conditional_headers(self, url: str) -> tuple:
+        """Return (cached entry, validator headers) for a URL.
+
+        The entry stores the last response body plus its ETag and
+        Last-Modified so an unchanged resource revalidates with a
+        zero-body 304 instead of a full download.
+        """
+        entry = self._cache.get(f"http:{url}")
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return entry, headers
+
+    def _store_validators(self, url: str, response, data: Any) -> None:
+        """Persist a response's body and validators for future 304s."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._cache.set(f"http:{url}", {
+                "etag": etag,
+                "last_modified": last_modified,
+                "data": data
+            })
+
     async def _fetch_pypi_info(self, package_name: str) -> Dict[str, Any]:
         """Fetch package information from PyPI"""
         try:
             await self._check_rate_limit("pypi.org")
             
             url = f"https://pypi.org/pypi/{package_name}/json"
-            async with self.session.get(url) as response:
+            cached, headers = self._conditional_headers(url)
+            async with (await self._get_session()).get(url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    return cached["data"]
                 if response.status == 200:
-                    data = await response.json()
-                    
+                    data = await _read_json(response)
+
                     # Extract relevant information
                     info = data.get("info", {})
-                    return {
+                    result = {
                         "name": info.get("name"),
                         "version": info.get("version"),
                         "description": info.get("description"),
@@ -107,6 +317,8 @@ class WebScraperAgent(BaseAgent):
                         "requires_python": info.get("requires_python"),
                         "summary": info.get("summary")
                     }
+                    self._store_validators(url, response, result)
+                    return result
                 return None
 
         except Exception as e:
@@ -118,174 +330,133 @@ class WebScraperAgent(BaseAgent):
         try:
             await self._check_rate_limit("github.com")
             
-            # Search for repository
-            search_url = f"https://api.github.com/search/repositories?q={package_name}+language:python"
+            # Search for repository; one result sorted by stars is all
+            # we use, and the search item already carries every field
+            # the summary needs
+            search_url = (
+                f"https://api.github.com/search/repositories"
+                f"?q={package_name}+language:python&sort=stars&per_page=1"
+            )
             headers = {"Accept": "application/vnd.github.v3+json"}
-            
+
             if os.getenv("GITHUB_TOKEN"):
                 headers["Authorization"] = f"token {os.getenv('GITHUB_TOKEN')}"
 
-            async with self.session.get(search_url, headers=headers) as response:
+            cached, validator_headers = self._conditional_headers(search_url)
+            headers.update(validator_headers)
+
+            async with (await self._get_session()).get(search_url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    return cached["data"]
                 if response.status == 200:
-                    data = await response.json()
+                    data = await _read_json(response)
                     if data["items"]:
                         repo = data["items"][0]  # Get the most relevant repository
-                        
-                        # Fetch additional repo information
-                        repo_url = repo["url"]
-                        async with self.session.get(repo_url, headers=headers) as repo_response:
-                            if repo_response.status == 200:
-                                repo_data = await repo_response.json()
-                                
-                                return {
-                                    "full_name": repo_data["full_name"],
-                                    "description": repo_data["description"],
-                                    "stars": repo_data["stargazers_count"],
-                                    "forks": repo_data["forks_count"],
-                                    "open_issues": repo_data["open_issues_count"],
-                                    "last_update": repo_data["updated_at"],
-                                    "license": repo_data.get("license", {}).get("name"),
-                                    "topics": repo_data.get("topics", []),
-                                    "homepage": repo_data.get("homepage"),
-                                    "default_branch": repo_data["default_branch"]
-                                }
+
+                        result = {
+                            "full_name": repo["full_name"],
+                            "description": repo["description"],
+                            "stars": repo["stargazers_count"],
+                            "forks": repo["forks_count"],
+                            "open_issues": repo["open_issues_count"],
+                            "last_update": repo["updated_at"],
+                            "license": (repo.get("license") or {}).get("name"),
+                            "topics": repo.get("topics", []),
+                            "homepage": repo.get("homepage"),
+                            "default_branch": repo["default_branch"]
+                        }
+                        self._store_validators(search_url, response, result)
+                        return result
                 return None
 
         except Exception as e:
             self.logger.error(f"Error fetching GitHub info for {package_name}: {str(e)}")
             return None
 
-    async def _fetch_readthedocs_info(self, package_name: str) -> Optional[Dict[str, Any]]:
-        """Fetch documentation from Read the Docs"""
-        try:
-            await self._check_rate_limit("readthedocs.org")
-            
-            url = f"https://{package_name}.readthedocs.io/en/latest/"
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    return {
-                        "url": url,
-                        "title": soup.title.string if soup.title else None,
-                        "sections": [
-                            h.text for h in soup.find_all(['h1', 'h2', 'h3'])
-                        ],
-                        "last_updated": datetime.now().isoformat()
-                    }
-                return None
+    async def _fetch_html(self, url: str) -> Optional[str]:
+        """Fetch a page body, reusing the cached copy when fresh.
 
-        except Exception as e:
-            self.logger.error(f"Error fetching ReadTheDocs info for {package_name}: {str(e)}")
+        Raw HTML is cached by URL so the two projections (overview and
+        full doc page) never trigger a second download of the same page.
+        """
+        cached = self._cache.get(f"html:{url}")
+        if cached is not None:
+            return cached
+
+        async with (await self._get_session()).get(url) as response:
+            if response.status == 200:
+                html = await response.text()
+                self._cache.set(f"html:{url}", html, expire=self.cache_duration)
+                return html
             return None
 
-    async def _fetch_package_docs(self, package_name: str) -> Optional[Dict[str, Any]]:
-        """Fetch and parse package documentation"""
+    async def _probe_docs(self, url: str) -> tuple:
+        """Try one candidate docs URL, returning (url, html-or-None)."""
         try:
-            # Try different documentation URLs
-            doc_urls = [
-                f"https://{package_name}.readthedocs.io/en/latest/",
+            return url, await self._fetch_html(url)
+        except Exception as e:
+            self.logger.debug(f"Error fetching docs from {url}: {str(e)}")
+            return url, None
+
+    async def _fetch_rtd_combined(self, package_name: str) -> tuple:
+        """Fetch Read the Docs once and derive both doc projections.
+
+        The overview and the full doc page used to each download the
+        same readthedocs.io URL; one fetch now feeds both parsers. The
+        alternate doc hosts are probed in parallel with Read the Docs
+        (the whole call runs under the shared request semaphore), so
+        when readthedocs.io 404s the fallback has already started
+        instead of paying the failed round-trips in sequence.
+        """
+        url = f"https://{package_name}.readthedocs.io/en/latest/"
+        await self._check_rate_limit("readthedocs.org")
+
+        rtd_task = asyncio.create_task(self._probe_docs(url))
+        alt_tasks = [
+            asyncio.create_task(self._probe_docs(alt_url))
+            for alt_url in (
                 f"https://docs.{package_name}.org",
                 f"https://{package_name}.org/docs"
-            ]
-            
-            for url in doc_urls:
-                try:
-                    async with self.session.get(url) as response:
-                        if response.status == 200:
-                            html = await response.text()
-                            soup = BeautifulSoup(html, 'html.parser')
-                            
-                            # Extract documentation content
-                            content = {
-                                "url": url,
-                                "title": soup.title.string if soup.title else None,
-                                "sections": {},
-                                "examples": [],
-                                "api_reference": {}
-                            }
-                            
-                            # Extract main sections
-                            for heading in soup.find_all(['h1', 'h2']):
-                                section_id = heading.get('id', '')
-                                section_content = []
-                                
-                                # Get all content until next heading
-                                for elem in heading.next_siblings:
-                                    if elem.name in ['h1', 'h2']:
-                                        break
-                                    if elem.name:
-                                        section_content.append(elem.get_text())
-                                
-                                content["sections"][heading.text.strip()] = "\n".join(section_content)
-                            
-                            # Extract code examples
-                            for code in soup.find_all('pre'):
-                                if code.text.strip():
-                                    content["examples"].append(code.text.strip())
-                            
-                            return content
-                            
-                except Exception as e:
-                    self.logger.debug(f"Error fetching docs from {url}: {str(e)}")
-                    continue
-            
-            return None
+            )
+        ]
 
-        except Exception as e:
-            self.logger.error(f"Error fetching package docs for {package_name}: {str(e)}")
-            return None
+        _, html = await rtd_task
+        if html is not None:
+            for task in alt_tasks:
+                task.cancel()
+            # Parsing a multi-hundred-KB page is CPU-bound; run it
+            # off-loop so other fetches keep progressing
+            return (
+                await asyncio.to_thread(_parse_docs_overview, html, url),
+                await asyncio.to_thread(_parse_doc_page, html, url)
+            )
 
-    async def _check_rate_limit(self, domain: str):
-        """Check and enforce rate limits for different domains"""
-        if domain in self.rate_limits:
-            limit_info = self.rate_limits[domain]
-            current_time = time.time()
-            
-            # Reset counter if minute has passed
-            if current_time - limit_info["last_reset"] >= 60:
-                limit_info["calls"] = 0
-                limit_info["last_reset"] = current_time
-            
-            # Check if limit reached
-            if limit_info["calls"] >= limit_info["limit"]:
-                wait_time = 60 - (current_time - limit_info["last_reset"])
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                    limit_info["calls"] = 0
-                    limit_info["last_reset"] = time.time()
-            
-            limit_info["calls"] += 1
+        # Read the Docs failed: take the first alternate host that
+        # answers and cancel the rest
+        result = None
+        for fut in asyncio.as_completed(alt_tasks):
+            alt_url, html = await fut
+            if html is not None:
+                result = (alt_url, html)
+                break
+        for task in alt_tasks:
+            task.cancel()
 
-    def _get_cache_path(self, key: str) -> str:
-        """Get the file path for a cache key"""
-        hash_key = hashlib.md5(key.encode()).hexdigest()
-        return os.path.join(self.cache_dir, f"{hash_key}.json")
+        if result is not None:
+            alt_url, html = result
+            return None, await asyncio.to_thread(_parse_doc_page, html, alt_url)
+        return None, None
+
+    async def _check_rate_limit(self, domain: str):
+        """Take one rate-limit token for the domain, waiting for refill if empty"""
+        idx = self._host_idx.get(domain)
+        if idx is not None:
+            await self._buckets[idx].acquire()
 
     def _get_from_cache(self, key: str) -> Optional[Dict[str, Any]]:
         """Get data from cache if it exists and is not expired"""
-        cache_path = self._get_cache_path(key)
-        
-        if os.path.exists(cache_path):
-            with open(cache_path, 'r') as f:
-                cached_data = json.load(f)
-                
-            # Check if cache is expired
-            cached_time = datetime.fromisoformat(cached_data.get("cached_at", "2000-01-01"))
-            if (datetime.now() - cached_time).total_seconds() < self.cache_duration:
-                return cached_data.get("data")
-        
-        return None
+        return self._cache.get(key)
 
     def _save_to_cache(self, key: str, data: Dict[str, Any]):
-        """Save data to cache"""
-        cache_path = self._get_cache_path(key)
-        
-        cache_data = {
-            "data": data,
-            "cached_at": datetime.now().isoformat()
-        }
-        
-        with open(cache_path, 'w') as f:
-            json.dump(cache_data, f)
\ No newline at end of file
+        """Save data to cache with the configured TTL"""
+        self._cache.set(key, data, expire=self.cache_duration)
\ No newline at end of file
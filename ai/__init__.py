@@ -1,8 +1,9 @@
 # sdk_assistant/ai/__init__.py
-from .openai_client import OpenAIClient
+from .openai_client import OpenAIClient, BatchProcessor
 from .claude_client import ClaudeClient
 
 __all__ = [
     'OpenAIClient',
+    'BatchProcessor',
     'ClaudeClient'
 ]
\ No newline at end of file
@@ -1,23 +1,38 @@
 # ai/claude_client.py
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from typing import Dict, Any
 
 class ClaudeClient:
     def __init__(self, config: Dict[str, Any]):
-        self.client = Anthropic(api_key=config["api_key"])
+        # AsyncAnthropic so analyze genuinely awaits instead of blocking
+        # the event loop on a sync HTTP call
+        self.client = AsyncAnthropic(api_key=config["api_key"])
         self.model = config["model"]
 
     async def analyze(self, content: str, prompt_template: str) -> Dict[str, Any]:
-        prompt = prompt_template.format(content=content)
-        
+        # Keep the static template in a cache_control system block so
+        # Anthropic's prompt cache reuses it across calls; only the
+        # variable content travels in the message. The templates carry a
+        # {content} placeholder from the old .format() flow — strip it
+        # so the system prompt doesn't ship a dangling literal. The
+        # result is identical bytes per template, so the cache still hits.
+        system_text = prompt_template.replace("{content}", "").strip()
         response = await self.client.messages.create(
             model=self.model,
+            max_tokens=2000,
+            system=[
+                {
+                    "type": "text",
+                    "text": system_text,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
             messages=[
                 {
                     "role": "user",
-                    "content": f"{prompt}\n\n{content}"
+                    "content": content
                 }
             ]
         )
-        
+
         return response.content[0].text
\ No newline at end of file
